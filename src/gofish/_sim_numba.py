@@ -0,0 +1,328 @@
+"""
+Compiled simulation core for the Go Fish simulator.
+Plays complete games on integer arrays with Numba, for Monte-Carlo batches
+where the object-oriented GoFishGame would spend most of its time in the
+interpreter. Requires the optional numpy and numba packages.
+"""
+import numpy as np
+from numba import njit, prange
+
+N_RANKS = 13
+DECK_SIZE = 52
+
+# Strategy ids, matching the strategy_id attribute of the player classes
+RANDOM = 0
+SMART = 1
+MEMORY = 2
+
+# Mersenne Twister parameters of the generator behind random.Random. The
+# state is an int64 array of the 624 state words followed by the position,
+# laid out like the middle item of random.Random.getstate().
+_MT_N = 624
+_MT_M = 397
+_MASK32 = 0xFFFFFFFF
+
+
+@njit(cache=True)
+def _next_word(mt):
+    """Return the next 32-bit output of a Mersenne Twister state."""
+    pos = mt[_MT_N]
+    if pos >= _MT_N:
+        for i in range(_MT_N):
+            y = (mt[i] & 0x80000000) | (mt[(i + 1) % _MT_N] & 0x7FFFFFFF)
+            value = mt[(i + _MT_M) % _MT_N] ^ (y >> 1)
+            if y & 1:
+                value ^= 0x9908B0DF
+            mt[i] = value
+        pos = 0
+    mt[_MT_N] = pos + 1
+    y = mt[pos]
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9D2C5680
+    y ^= (y << 15) & 0xEFC60000
+    y ^= y >> 18
+    return y
+
+
+@njit(cache=True)
+def _randbelow(mt, n):
+    """Return a random int in [0, n) exactly like random.Random._randbelow."""
+    bits = 0
+    while n >> bits:
+        bits += 1
+    r = _next_word(mt) >> (32 - bits)
+    while r >= n:
+        r = _next_word(mt) >> (32 - bits)
+    return r
+
+
+@njit(cache=True)
+def _seed_state(seed):
+    """Return the state random.Random(seed) starts from, for 0 <= seed < 2**63."""
+    mt = np.empty(_MT_N + 1, np.int64)
+    mt[0] = 19650218
+    for i in range(1, _MT_N):
+        mt[i] = (1812433253 * (mt[i - 1] ^ (mt[i - 1] >> 30)) + i) & _MASK32
+    
+    # The seed is split into 32-bit key words, least significant first
+    key = np.zeros(2, np.int64)
+    key[0] = seed & _MASK32
+    key[1] = seed >> 32
+    key_length = 2 if key[1] else 1
+    
+    i = 1
+    j = 0
+    for _ in range(max(_MT_N, key_length)):
+        mt[i] = ((mt[i] ^ ((mt[i - 1] ^ (mt[i - 1] >> 30)) * 1664525)) + key[j] + j) & _MASK32
+        i += 1
+        j += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+        if j >= key_length:
+            j = 0
+    for _ in range(_MT_N - 1):
+        mt[i] = ((mt[i] ^ ((mt[i - 1] ^ (mt[i - 1] >> 30)) * 1566083941)) - i) & _MASK32
+        i += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+    mt[0] = 0x80000000
+    mt[_MT_N] = _MT_N
+    return mt
+
+
+@njit(cache=True)
+def _shuffled_deck(mt):
+    """
+    Return the ranks of a deck shuffled like Deck(shuffled=True), in draw order.
+    
+    Deck samples the standard deck with random.sample and draws from the
+    end, so the sample is stored back to front.
+    """
+    pool = np.empty(DECK_SIZE, np.int8)
+    for i in range(DECK_SIZE):
+        pool[i] = i % N_RANKS
+    deck = np.empty(DECK_SIZE, np.int8)
+    for i in range(DECK_SIZE):
+        j = _randbelow(mt, DECK_SIZE - i)
+        deck[DECK_SIZE - 1 - i] = pool[j]
+        pool[j] = pool[DECK_SIZE - i - 1]
+    return deck
+
+
+@njit(cache=True)
+def _draw(deck, deck_top, hands, hand_sizes, player):
+    """Move the top card of the deck into a player's hand and return its rank."""
+    rank = deck[deck_top]
+    hands[player, rank] += 1
+    hand_sizes[player] += 1
+    return rank
+
+
+@njit(cache=True)
+def _check_book(hands, hand_sizes, book_owners, player, rank):
+    """Lay down a book of the given rank if the player holds all four cards."""
+    if hands[player, rank] == 4:
+        hands[player, rank] = 0
+        hand_sizes[player] -= 4
+        book_owners[rank] = player
+        return True
+    return False
+
+
+@njit(cache=True)
+def _choose_rank(hands, player, strategy, mt):
+    """Pick the rank to ask for; the player's hand must not be empty."""
+    if strategy == RANDOM:
+        # random.choice over the held ranks in ascending order
+        held = 0
+        for rank in range(N_RANKS):
+            if hands[player, rank]:
+                held += 1
+        pick = _randbelow(mt, held)
+        for rank in range(N_RANKS):
+            if hands[player, rank]:
+                if pick == 0:
+                    return rank
+                pick -= 1
+    return np.argmax(hands[player])
+
+
+@njit(cache=True)
+def _choose_target(known, player, n_players, rank, strategy, mt):
+    """Pick the player to ask for the given rank."""
+    if strategy == SMART:
+        # Ask the first player known to hold the rank
+        for target in range(n_players):
+            if target != player and known[player, target, rank]:
+                return target
+    # MemoryPlayer only consults ranks recorded through record_ask, which
+    # the game loop never records, so it asks at random like RandomPlayer.
+    target = _randbelow(mt, n_players - 1)
+    if target >= player:
+        target += 1
+    return target
+
+
+@njit(cache=True, boundscheck=False)
+def play_game(strategies, deck, initial_cards, mt):
+    """
+    Play a complete game of Go Fish.
+    
+    Each player follows the strategy with the given id (see the strategy_id
+    attribute of the player classes). The turn rules mirror
+    GoFishGame.play_turn, and a turn is counted for every call it would make.
+    Random choices draw from mt exactly as the Python players draw from
+    random.Random, so a game started from the same deck and state plays out
+    like GoFishGame.play_game.
+    
+    Args:
+        strategies: Array with the strategy id of each player
+        deck: Array with the rank of each card in the deck, in draw order
+        initial_cards: Number of cards to deal to each player at the start
+        mt: Mersenne Twister state, advanced in place
+        
+    Returns:
+        Tuple of (array with the index of the player who laid down the book
+        of each rank, or -1 if no one did, number of turns played)
+    """
+    n_players = len(strategies)
+    deck_size = len(deck)
+    deck_top = 0
+    
+    hands = np.zeros((n_players, N_RANKS), np.int8)
+    hand_sizes = np.zeros(n_players, np.int64)
+    book_owners = np.full(N_RANKS, -1, np.int8)
+    # known[i, j, r]: player i has seen player j hand over cards of rank r
+    known = np.zeros((n_players, n_players, N_RANKS), np.bool_)
+    
+    # Deal initial cards and lay down any books in the initial hands
+    for player in range(n_players):
+        for _ in range(initial_cards):
+            if deck_top == deck_size:
+                break
+            _draw(deck, deck_top, hands, hand_sizes, player)
+            deck_top += 1
+        for rank in range(N_RANKS):
+            _check_book(hands, hand_sizes, book_owners, player, rank)
+    
+    cards_in_hands = hand_sizes.sum()
+    current = 0
+    turns = 0
+    # Like GoFishGame.play_game, check for the end only after the first turn
+    while turns == 0 or cards_in_hands > 0:
+        turns += 1
+        if hand_sizes[current] == 0:
+            if deck_top == deck_size:
+                current = (current + 1) % n_players
+                continue
+            rank = _draw(deck, deck_top, hands, hand_sizes, current)
+            deck_top += 1
+            cards_in_hands += 1
+            if _check_book(hands, hand_sizes, book_owners, current, rank):
+                cards_in_hands -= 4
+            if hand_sizes[current] == 0:
+                current = (current + 1) % n_players
+                continue
+        
+        strategy = strategies[current]
+        rank = _choose_rank(hands, current, strategy, mt)
+        target = _choose_target(known, current, n_players, rank, strategy, mt)
+        
+        if hands[target, rank] > 0:
+            # Take the matching cards; the player gets another turn
+            known[current, target, rank] = True
+            taken = hands[target, rank]
+            hands[target, rank] = 0
+            hand_sizes[target] -= taken
+            hands[current, rank] += taken
+            hand_sizes[current] += taken
+            if _check_book(hands, hand_sizes, book_owners, current, rank):
+                cards_in_hands -= 4
+            continue
+        
+        # Go fish
+        known[current, target, rank] = False
+        if deck_top < deck_size:
+            drawn = _draw(deck, deck_top, hands, hand_sizes, current)
+            deck_top += 1
+            cards_in_hands += 1
+            if _check_book(hands, hand_sizes, book_owners, current, drawn):
+                cards_in_hands -= 4
+            if drawn == rank:
+                continue
+        current = (current + 1) % n_players
+    
+    return book_owners, turns
+
+
+def run_game(strategy_ids, deck_cards, initial_cards, rng):
+    """
+    Play a compiled game from a Python game's deck and random state.
+    
+    Args:
+        strategy_ids: Strategy id of each player
+        deck_cards: Card codes of the deck, drawn from the end like Deck.cards
+        initial_cards: Number of cards to deal to each player at the start
+        rng: random.Random instance or the random module; its state is
+             advanced exactly as the Python game would advance it
+        
+    Returns:
+        Tuple of (list with the index of the player who laid down the book
+        of each rank, or -1 if no one did, number of turns played)
+    """
+    version, internal_state, gauss_next = rng.getstate()
+    mt = np.array(internal_state, np.int64)
+    # Card codes keep the rank in the low nibble; reverse into draw order
+    deck = (np.frombuffer(bytes(deck_cards), np.uint8)[::-1] & 0xF).astype(np.int8)
+    book_owners, turns = play_game(np.array(strategy_ids, np.int8), deck, initial_cards, mt)
+    rng.setstate((version, tuple(mt.tolist()), gauss_next))
+    return book_owners.tolist(), turns
+
+
+@njit(cache=True)
+def simulate_game(strategies, initial_cards, seed):
+    """
+    Play a complete game of Go Fish and count the books of each player.
+    
+    The game is the one GoFishGame plays with its rng set to
+    random.Random(seed).
+    
+    Args:
+        strategies: Array with the strategy id of each player
+        initial_cards: Number of cards to deal to each player at the start
+        seed: Seed for the random number generator, 0 <= seed < 2**63
+        
+    Returns:
+        Tuple of (index of the first player with the most books,
+        array of book counts per player)
+    """
+    mt = _seed_state(seed)
+    book_owners, _ = play_game(strategies, _shuffled_deck(mt), initial_cards, mt)
+    books = np.zeros(len(strategies), np.int8)
+    for owner in book_owners:
+        if owner >= 0:
+            books[owner] += 1
+    return np.argmax(books), books
+
+
+@njit(parallel=True, cache=True)
+def simulate_games(n_games, strategies, initial_cards, seed):
+    """
+    Play many independent games in parallel.
+    
+    Args:
+        n_games: Number of games to play
+        strategies: Array with the strategy id of each player
+        initial_cards: Number of cards to deal to each player at the start
+        seed: Base seed; game i is played with seed + i
+        
+    Returns:
+        Array of shape (n_games, n_players) with the book counts of each game
+    """
+    all_books = np.zeros((n_games, len(strategies)), np.int8)
+    for game in prange(n_games):
+        _, books = simulate_game(strategies, initial_cards, seed + game)
+        all_books[game] = books
+    return all_books
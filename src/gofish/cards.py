@@ -3,64 +3,81 @@ Card library for the Go Fish simulator.
 Provides classes and methods to manipulate cards and decks.
 """
 import random
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 
-class Card:
-    """Represents a standard playing card."""
-    RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+
+# A card is a plain int: the rank index (0-12) lives in the low nibble and
+# the suit index (0-3) in the high nibble. Ranks are passed around as the
+# bare rank index.
+Card = int
+
+# Template of a standard 52-card deck, copied by every new Deck
+_STANDARD_DECK = bytes(suit << 4 | rank
+                       for suit in range(len(SUITS))
+                       for rank in range(len(RANKS)))
+
+
+def make_card(rank: str, suit: str) -> Card:
+    """
+    Encode a card from its rank and suit names.
     
-    def __init__(self, rank: str, suit: str):
-        """
-        Initialize a card with a rank and suit.
+    Args:
+        rank: The rank of the card (2-10, J, Q, K, A)
+        suit: The suit of the card (Hearts, Diamonds, Clubs, Spades)
         
-        Args:
-            rank: The rank of the card (2-10, J, Q, K, A)
-            suit: The suit of the card (Hearts, Diamonds, Clubs, Spades)
-        """
-        if rank not in self.RANKS:
-            raise ValueError(f"Invalid rank: {rank}")
-        if suit not in self.SUITS:
-            raise ValueError(f"Invalid suit: {suit}")
-            
-        self.rank = rank
-        self.suit = suit
-    
-    def __str__(self) -> str:
-        """Return a string representation of the card."""
-        return f"{self.rank} of {self.suit}"
-    
-    def __eq__(self, other) -> bool:
-        """Check if two cards are equal (same rank and suit)."""
-        if not isinstance(other, Card):
-            return False
-        return self.rank == other.rank and self.suit == other.suit
-    
-    def same_rank(self, other) -> bool:
-        """Check if two cards have the same rank."""
-        if not isinstance(other, Card):
-            return False
-        return self.rank == other.rank
+    Returns:
+        The integer encoding of the card
+    """
+    if rank not in RANKS:
+        raise ValueError(f"Invalid rank: {rank}")
+    if suit not in SUITS:
+        raise ValueError(f"Invalid suit: {suit}")
+    return SUITS.index(suit) << 4 | RANKS.index(rank)
+
+
+def rank_of(card: Card) -> int:
+    """Return the rank index of a card."""
+    return card & 0xF
+
+
+def suit_of(card: Card) -> int:
+    """Return the suit index of a card."""
+    return card >> 4
+
+
+def card_str(card: Card) -> str:
+    """Return a string representation of the card."""
+    return f"{RANKS[card & 0xF]} of {SUITS[card >> 4]}"
 
 
 class Deck:
     """Represents a deck of playing cards."""
     
-    def __init__(self, cards: Optional[List[Card]] = None):
+    def __init__(self, cards: Optional[List[Card]] = None, shuffled: bool = False,
+                 rng: Optional[random.Random] = None):
         """
         Initialize a deck of cards.
         
         Args:
             cards: Optional list of cards to initialize the deck with.
                   If None, a standard 52-card deck is created.
+            shuffled: Whether to create the standard deck already shuffled.
+                      Ignored when cards are given.
+            rng: Random number generator used for shuffling
+                 (default: the shared random module state)
         """
+        self.rng = rng if rng is not None else random
+        # Every card code fits in a byte, so the deck is stored compactly
         if cards is not None:
-            self.cards = cards.copy()
+            self.cards = bytearray(cards)
+        elif shuffled:
+            # Sampling the whole pool shuffles while building the deck
+            self.cards = bytearray(self.rng.sample(_STANDARD_DECK, len(_STANDARD_DECK)))
         else:
-            self.cards = [Card(rank, suit) 
-                         for suit in Card.SUITS 
-                         for rank in Card.RANKS]
+            self.cards = bytearray(_STANDARD_DECK)
     
     def __len__(self) -> int:
         """Return the number of cards in the deck."""
@@ -68,18 +85,17 @@ class Deck:
     
     def shuffle(self) -> None:
         """Shuffle the deck of cards."""
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
     def draw(self) -> Optional[Card]:
         """
         Draw a card from the top of the deck.
         
         Returns:
-            A Card object if the deck is not empty, None otherwise.
+            A card if the deck is not empty, None otherwise.
         """
-        if not self.cards:
-            return None
-        return self.cards.pop(0)
+        # The end of the list is the top of the deck, so drawing is O(1)
+        return self.cards.pop() if self.cards else None
     
     def draw_multiple(self, count: int) -> List[Card]:
         """
@@ -89,13 +105,14 @@ class Deck:
             count: Number of cards to draw
             
         Returns:
-            A list of Card objects (may be fewer than requested if deck runs out)
+            A list of cards (may be fewer than requested if deck runs out)
         """
-        drawn_cards = []
-        for _ in range(min(count, len(self.cards))):
-            card = self.draw()
-            if card:
-                drawn_cards.append(card)
+        count = min(count, len(self.cards))
+        if count <= 0:
+            return []
+        # Reverse the tail so cards come out in the same order as repeated draws
+        drawn_cards = list(self.cards[-1:-count - 1:-1])
+        del self.cards[-count:]
         return drawn_cards
     
     def add_card(self, card: Card) -> None:
@@ -103,18 +120,21 @@ class Deck:
         Add a card to the bottom of the deck.
         
         Args:
-            card: The Card object to add
+            card: The card to add
         """
-        self.cards.append(card)
+        # The bottom is the start of the list, so this shifts the deck's at
+        # most 52 bytes in one memmove; the game itself never adds cards back
+        self.cards.insert(0, card)
     
     def add_cards(self, cards: List[Card]) -> None:
         """
         Add multiple cards to the bottom of the deck.
         
         Args:
-            cards: List of Card objects to add
+            cards: List of cards to add, in the order they will later be drawn
         """
-        self.cards.extend(cards)
+        # Reversed so the first card given is still drawn first
+        self.cards[:0] = cards[::-1]
     
     def is_empty(self) -> bool:
         """Check if the deck is empty."""
@@ -127,6 +147,8 @@ class Hand:
     def __init__(self):
         """Initialize an empty hand."""
         self.cards = []
+        # Number of cards held of each rank, kept in step with self.cards
+        self.rank_counts = [0] * len(RANKS)
     
     def __len__(self) -> int:
         """Return the number of cards in the hand."""
@@ -137,36 +159,44 @@ class Hand:
         Add a card to the hand.
         
         Args:
-            card: The Card object to add
+            card: The card to add
         """
         self.cards.append(card)
+        self.rank_counts[card & 0xF] += 1
     
     def add_cards(self, cards: List[Card]) -> None:
         """
         Add multiple cards to the hand.
         
         Args:
-            cards: List of Card objects to add
+            cards: List of cards to add
         """
         self.cards.extend(cards)
+        rank_counts = self.rank_counts
+        for card in cards:
+            rank_counts[card & 0xF] += 1
     
     def remove_card(self, card: Card) -> bool:
         """
         Remove a specific card from the hand.
         
         Args:
-            card: The Card object to remove
+            card: The card to remove
             
         Returns:
             True if the card was removed, False if it wasn't in the hand
         """
-        for i, c in enumerate(self.cards):
-            if c == card:
-                self.cards.pop(i)
-                return True
-        return False
+        # No card of this rank means the card cannot be in the hand
+        if not self.rank_counts[card & 0xF]:
+            return False
+        try:
+            self.cards.remove(card)
+        except ValueError:
+            return False
+        self.rank_counts[card & 0xF] -= 1
+        return True
     
-    def remove_cards_of_rank(self, rank: str) -> List[Card]:
+    def remove_cards_of_rank(self, rank: int) -> List[Card]:
         """
         Remove all cards of a specific rank from the hand.
         
@@ -174,34 +204,23 @@ class Hand:
             rank: The rank to remove
             
         Returns:
-            List of Card objects that were removed
+            List of cards that were removed
         """
+        if not self.rank_counts[rank]:
+            return []
+        # Partition the hand in a single pass
         removed_cards = []
-        self.cards, removed_cards = self._partition_cards(lambda c: c.rank != rank)
-        return removed_cards
-    
-    def _partition_cards(self, predicate) -> Tuple[List[Card], List[Card]]:
-        """
-        Helper method to partition cards based on a predicate.
-        
-        Args:
-            predicate: Function that takes a Card and returns a boolean
-            
-        Returns:
-            Tuple of (cards_that_match, cards_that_dont_match)
-        """
-        matching = []
-        non_matching = []
-        
+        kept_cards = []
         for card in self.cards:
-            if predicate(card):
-                matching.append(card)
+            if card & 0xF == rank:
+                removed_cards.append(card)
             else:
-                non_matching.append(card)
-                
-        return matching, non_matching
+                kept_cards.append(card)
+        self.cards = kept_cards
+        self.rank_counts[rank] = 0
+        return removed_cards
     
-    def has_rank(self, rank: str) -> bool:
+    def has_rank(self, rank: int) -> bool:
         """
         Check if the hand contains a card of the specified rank.
         
@@ -211,41 +230,48 @@ class Hand:
         Returns:
             True if the hand contains at least one card of the specified rank
         """
-        return any(card.rank == rank for card in self.cards)
+        return self.rank_counts[rank] > 0
     
-    def get_ranks(self) -> List[str]:
+    def get_ranks(self) -> List[int]:
         """
         Get a list of all ranks in the hand.
         
         Returns:
-            List of rank strings
+            List of rank indices
         """
-        return list(set(card.rank for card in self.cards))
+        return [rank for rank, count in enumerate(self.rank_counts) if count]
     
-    def find_books(self) -> List[str]:
+    def find_books(self) -> List[int]:
         """
         Find all books (sets of 4 cards of the same rank) in the hand.
         
         Returns:
             List of ranks that form books
         """
-        rank_counts = {}
-        for card in self.cards:
-            rank_counts[card.rank] = rank_counts.get(card.rank, 0) + 1
-        
-        return [rank for rank, count in rank_counts.items() if count == 4]
+        return [rank for rank, count in enumerate(self.rank_counts) if count == 4]
     
     def remove_books(self) -> List[List[Card]]:
         """
         Remove all books from the hand.
         
         Returns:
-            List of books (each book is a list of 4 Card objects)
+            List of books (each book is a list of 4 cards)
         """
-        books = []
-        for rank in self.find_books():
-            cards = [card for card in self.cards if card.rank == rank]
-            books.append(cards)
-            self.cards = [card for card in self.cards if card.rank != rank]
+        book_ranks = self.find_books()
+        if not book_ranks:
+            return []
+        
+        # Split the hand into books and remaining cards in a single pass
+        books = {rank: [] for rank in book_ranks}
+        kept_cards = []
+        for card in self.cards:
+            book = books.get(card & 0xF)
+            if book is None:
+                kept_cards.append(card)
+            else:
+                book.append(card)
+        self.cards = kept_cards
+        for rank in book_ranks:
+            self.rank_counts[rank] = 0
         
-        return books
\ No newline at end of file
+        return list(books.values())
\ No newline at end of file
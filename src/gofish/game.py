@@ -3,19 +3,47 @@ Game module for the Go Fish simulator.
 Contains the core game logic and rules.
 """
 import random
-from typing import List, Optional, Dict, Tuple
+import sys
+from typing import List, Optional, Dict, TextIO, Tuple
 
-from .cards import Card, Deck
+from .cards import RANKS, Deck, card_str, rank_of
 from .player import Player
 
 
+def _discard_message(message: str, *args) -> None:
+    """Ignore a game progress message."""
+
+
+# The compiled core module, False once it failed to import, None until first use
+_compiled_core = None
+
+
+def _load_compiled_core():
+    """
+    Import the compiled simulation core on first use.
+    
+    Returns:
+        The gofish._sim_numba module, or None if numpy or numba is not installed
+    """
+    global _compiled_core
+    if _compiled_core is None:
+        try:
+            from . import _sim_numba
+            _compiled_core = _sim_numba
+        except ImportError:
+            _compiled_core = False
+    return _compiled_core or None
+
+
 class GoFishGame:
     """
     Represents a game of Go Fish.
     This class encapsulates the rules and logic of the game.
     """
     
-    def __init__(self, players: List[Player], initial_cards: int = 7, verbose: bool = True):
+    def __init__(self, players: List[Player], initial_cards: int = 7, verbose: bool = True,
+                 use_compiled: bool = False, out: Optional[TextIO] = None,
+                 rng: Optional[random.Random] = None):
         """
         Initialize a new game of Go Fish.
         
@@ -23,31 +51,60 @@ class GoFishGame:
             players: List of Player objects
             initial_cards: Number of cards to deal to each player at the start
             verbose: Whether to print game progress messages
+            use_compiled: Whether a quiet game may run on the compiled
+                          simulation core when numba is installed; it
+                          plays out exactly as the Python game would
+            out: Stream for game progress messages (default: sys.stdout)
+            rng: Random number generator for the deck and all players' choices
+                 (default: the shared random module state)
         """
         if len(players) < 2:
             raise ValueError("Go Fish requires at least 2 players")
         
         self.players = players
+        # Lookup tables for resolving who the current player can ask
+        self._name_to_player = {p.name: p for p in players}
+        self._others = [[p.name for j, p in enumerate(players) if j != i]
+                        for i in range(len(players))]
+        # Players who watch the asks of each player, skipping the no-op default
+        watchers = [p for p in players if type(p).observe_ask is not Player.observe_ask]
+        self._observers = [[q for q in watchers if q is not p] for p in players]
         self.initial_cards = initial_cards
         self.verbose = verbose
-        self.deck = Deck()
+        self.use_compiled = use_compiled
+        self.out = out if out is not None else sys.stdout
+        self._log = self._write_message if verbose else _discard_message
+        self.rng = rng if rng is not None else random
+        if rng is not None:
+            for player in players:
+                player.rng = rng
+        self.deck = Deck(shuffled=True, rng=self.rng)
         self.current_player_idx = 0
         self.game_over = False
         self.turn_count = 0
+        # Cards held across all hands; the game ends when it drops to zero
+        self._cards_in_hands = sum(len(p.hand) for p in players)
         
+    def _write_message(self, message: str, *args) -> None:
+        """Write a game progress message, formatting it only when written."""
+        self.out.write((message % args if args else message) + "\n")
+    
     def setup(self) -> None:
-        """Set up the game by shuffling the deck and dealing cards."""
-        self.deck.shuffle()
-        
+        """Set up the game by dealing cards from the shuffled deck."""
+        for player in self.players:
+            player.join_game(self)
+            
         # Deal initial cards to each player
         for player in self.players:
             cards = self.deck.draw_multiple(self.initial_cards)
             player.add_cards(cards)
+            self._cards_in_hands += len(cards)
             
             # Check for any books in the initial hand
-            books = player.check_for_books()
+            books = self._check_for_books(player)
             if books and self.verbose:
-                print(f"{player.name} found {len(books)} book(s) in their initial hand: {', '.join(books)}")
+                self._log("%s found %d book(s) in their initial hand: %s",
+                          player.name, len(books), ', '.join(RANKS[r] for r in books))
     
     def play_turn(self) -> bool:
         """
@@ -62,112 +119,105 @@ class GoFishGame:
         self.turn_count += 1
         current_player = self.players[self.current_player_idx]
         
-        if self.verbose:
-            print(f"\n--- Turn {self.turn_count}: {current_player.name}'s turn ---")
+        self._log("\n--- Turn %d: %s's turn ---", self.turn_count, current_player.name)
         
         # Check if the current player has any cards
         if not current_player.has_cards():
             if self.deck.is_empty():
-                if self.verbose:
-                    print(f"{current_player.name} has no cards and the deck is empty.")
+                self._log("%s has no cards and the deck is empty.", current_player.name)
                 self.advance_turn()
                 return self.check_game_over()
             else:
                 # Draw a card from the deck
                 card = self.deck.draw()
-                if card:
+                if card is not None:
                     current_player.add_card(card)
+                    self._cards_in_hands += 1
                     if self.verbose:
-                        print(f"{current_player.name} had no cards and drew {card} from the deck.")
+                        self._log("%s had no cards and drew %s from the deck.",
+                                  current_player.name, card_str(card))
                     
                     # Check for books
-                    books = current_player.check_for_books()
-                    if books and self.verbose:
-                        print(f"{current_player.name} found a book of {books[0]}!")
+                    books = self._check_for_books(current_player)
+                    if books:
+                        self._log("%s found a book of %s!", current_player.name, RANKS[books[0]])
         
+        # Choose a rank to ask for
+        rank = current_player.choose_rank_to_ask_for()
+        if rank is None:
+            self._log("%s has no cards to ask for.", current_player.name)
+            self.advance_turn()
+            return self.check_game_over()
+            
         # Get other players' names
-        other_players = [p.name for p in self.players if p != current_player]
+        other_players = self._others[self.current_player_idx]
         if not other_players:
             self.game_over = True
             return False
             
-        # Choose a player to ask
-        target_player_name = current_player.choose_player_to_ask(other_players)
-        target_player = next(p for p in self.players if p.name == target_player_name)
+        # Choose a player to ask for that rank
+        target_player_name = current_player.choose_player_to_ask(other_players, rank)
+        target_player = self._name_to_player[target_player_name]
         
-        # Choose a rank to ask for
-        rank = current_player.choose_rank_to_ask_for()
-        if not rank:
-            if self.verbose:
-                print(f"{current_player.name} has no cards to ask for.")
-            self.advance_turn()
-            return self.check_game_over()
-            
-        if self.verbose:
-            print(f"{current_player.name} asks {target_player_name} for {rank}s.")
+        self._log("%s asks %s for %ss.", current_player.name, target_player_name, RANKS[rank])
         
-        # Check if the target player has any cards of the requested rank
-        matching_cards = [card for card in target_player.hand.cards if card.rank == rank]
+        # Take any cards of the requested rank from the target player
+        matching_cards = target_player.hand.remove_cards_of_rank(rank)
+        for observer in self._observers[self.current_player_idx]:
+            observer.observe_ask(current_player.name, target_player_name, rank, len(matching_cards))
         
         if matching_cards:
             # Target player has matching cards
-            if self.verbose:
-                print(f"{target_player_name} has {len(matching_cards)} {rank}(s)!")
-                
+            self._log("%s has %d %s(s)!", target_player_name, len(matching_cards), RANKS[rank])
+            
             # Update knowledge
             current_player.update_knowledge(target_player_name, rank, True)
             
             # Transfer the cards
-            for card in matching_cards:
-                target_player.hand.remove_card(card)
-                current_player.add_card(card)
+            current_player.add_cards(matching_cards)
                 
             # Check for books
-            books = current_player.check_for_books()
-            if books and self.verbose:
-                for book_rank in books:
-                    print(f"{current_player.name} completed a book of {book_rank}s!")
+            books = self._check_for_books(current_player)
+            for book_rank in books:
+                self._log("%s completed a book of %ss!", current_player.name, RANKS[book_rank])
                     
             # Player gets another turn
             return self.check_game_over()
         else:
             # Target player doesn't have matching cards
-            if self.verbose:
-                print(f"{target_player_name} says 'Go Fish!'")
-                
+            self._log("%s says 'Go Fish!'", target_player_name)
+            
             # Update knowledge
             current_player.update_knowledge(target_player_name, rank, False)
             
             # Draw a card from the deck
             if not self.deck.is_empty():
                 card = self.deck.draw()
-                if card:
+                if card is not None:
                     current_player.add_card(card)
-                    if self.verbose:
-                        print(f"{current_player.name} draws a card from the deck.")
+                    self._cards_in_hands += 1
+                    self._log("%s draws a card from the deck.", current_player.name)
                         
                     # If the drawn card is the rank that was asked for, the player gets another turn
-                    if card.rank == rank:
+                    if rank_of(card) == rank:
                         if self.verbose:
-                            print(f"{current_player.name} drew the {card}, which is the rank they asked for!")
+                            self._log("%s drew the %s, which is the rank they asked for!",
+                                      current_player.name, card_str(card))
                             
                         # Check for books
-                        books = current_player.check_for_books()
-                        if books and self.verbose:
-                            for book_rank in books:
-                                print(f"{current_player.name} completed a book of {book_rank}s!")
+                        books = self._check_for_books(current_player)
+                        for book_rank in books:
+                            self._log("%s completed a book of %ss!", current_player.name, RANKS[book_rank])
                                 
                         # Player gets another turn
                         return self.check_game_over()
             else:
-                if self.verbose:
-                    print("The deck is empty.")
+                self._log("The deck is empty.")
             
             # Check for books
-            books = current_player.check_for_books()
-            if books and self.verbose:
-                for book_rank in books:
-                    print(f"{current_player.name} completed a book of {book_rank}s!")
+            books = self._check_for_books(current_player)
+            for book_rank in books:
+                self._log("%s completed a book of %ss!", current_player.name, RANKS[book_rank])
             
             # Move to the next player
             self.advance_turn()
@@ -185,18 +235,71 @@ class GoFishGame:
             True if the game should continue, False if it's over
         """
         # Game is over if all players have no cards or if all cards have been formed into books
-        all_cards_in_books = True
-        for player in self.players:
-            if player.has_cards():
-                all_cards_in_books = False
-                break
-                
-        if all_cards_in_books:
+        if self._cards_in_hands == 0:
             self.game_over = True
             return False
             
         return True
     
+    def _check_for_books(self, player: Player) -> List[int]:
+        """
+        Lay down a player's books and keep the count of cards in hands current.
+        
+        Args:
+            player: The player to check for books
+            
+        Returns:
+            List of ranks for which books were found and removed
+        """
+        books = player.check_for_books()
+        self._cards_in_hands -= 4 * len(books)
+        return books
+    
+    def _find_compiled_core(self):
+        """
+        Get the compiled simulation core if it would play this game exactly.
+        
+        Only quiet, not yet started games of a plain GoFishGame qualify. Every
+        player must be a built-in strategy with a compiled counterpart, have
+        no knowledge left over from an earlier game, and draw from the
+        game's Mersenne Twister random number generator.
+        
+        Returns:
+            The compiled core module, or None to play the game in Python
+        """
+        if not self.use_compiled or self.verbose or type(self) is not GoFishGame:
+            return None
+        if self.turn_count or self._cards_in_hands:
+            return None
+        if self.rng is not random and type(self.rng) is not random.Random:
+            return None
+        for player in self.players:
+            if (player.strategy_id is None or player.rng is not self.rng
+                    or player.known_cards or getattr(player, 'asked_ranks', None)):
+                return None
+        return _load_compiled_core()
+    
+    def _play_compiled(self, core) -> None:
+        """
+        Play the whole game on the compiled simulation core.
+        
+        Only the players' books, the turn count, the game over flag and the
+        random number generator are updated; the deck is left as it was.
+        
+        Args:
+            core: The compiled core module
+        """
+        book_owners, self.turn_count = core.run_game(
+            [p.strategy_id for p in self.players],
+            self.deck.cards,
+            self.initial_cards,
+            self.rng
+        )
+        for rank, owner in enumerate(book_owners):
+            if owner >= 0:
+                self.players[owner].books.append(rank)
+        self.game_over = True
+    
     def get_winner(self) -> List[Player]:
         """
         Determine the winner(s) of the game.
@@ -217,22 +320,27 @@ class GoFishGame:
         Returns:
             List of Player objects who won the game
         """
-        self.setup()
-        
-        while self.play_turn():
-            pass
+        core = self._find_compiled_core()
+        if core is not None:
+            self._play_compiled(core)
+        else:
+            self.setup()
+            
+            while self.play_turn():
+                pass
             
         winners = self.get_winner()
         
         if self.verbose:
-            print("\n--- Game Over ---")
+            self._log("\n--- Game Over ---")
             for player in self.players:
-                print(f"{player.name}: {player.get_score()} books")
+                self._log("%s: %d books", player.name, player.get_score())
                 
             if len(winners) == 1:
-                print(f"\nThe winner is {winners[0].name} with {winners[0].get_score()} books!")
+                self._log("\nThe winner is %s with %d books!", winners[0].name, winners[0].get_score())
             else:
                 winner_names = [player.name for player in winners]
-                print(f"\nThe game ended in a tie between {', '.join(winner_names)} with {winners[0].get_score()} books each!")
+                self._log("\nThe game ended in a tie between %s with %d books each!",
+                          ', '.join(winner_names), winners[0].get_score())
         
         return winners
\ No newline at end of file
@@ -2,38 +2,63 @@
 Player module for the Go Fish simulator.
 Defines the Player interface and various player strategy implementations.
 """
+import math
 import random
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Set, Tuple
+from collections import defaultdict
+from typing import TYPE_CHECKING, List, Optional, Dict, Set, Tuple
 
-from .cards import Card, Hand
+from .cards import RANKS, Card, Hand, card_str, rank_of
+
+if TYPE_CHECKING:
+    from .game import GoFishGame
 
 
 class Player(ABC):
     """Abstract base class for a Go Fish player."""
     
-    def __init__(self, name: str):
+    # Id of the equivalent strategy in the compiled simulation core,
+    # or None if the strategy has no compiled counterpart
+    strategy_id: Optional[int] = None
+    
+    def __init_subclass__(cls, **kwargs):
+        """Give subclasses no compiled strategy unless they declare their own."""
+        super().__init_subclass__(**kwargs)
+        # A subclass may override any choice, so it must not inherit the id
+        if 'strategy_id' not in vars(cls):
+            cls.strategy_id = None
+    
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
         """
         Initialize a player.
         
         Args:
             name: The player's name
+            rng: Random number generator for the player's choices
+                 (default: the shared random module state)
         """
         self.name = name
+        self.rng = rng if rng is not None else random
         self.hand = Hand()
         self.books = []  # List of ranks for which the player has collected books
-        self.known_cards: Dict[str, Set[str]] = {}  # Player's knowledge of other players' cards
+        self.known_cards: Dict[str, Set[int]] = {}  # Player's knowledge of other players' cards
     
     def __str__(self) -> str:
         """Return a string representation of the player."""
         return f"{self.name} (Books: {len(self.books)})"
     
+    def reset(self) -> None:
+        """Clear the player's hand, books and knowledge before a new game."""
+        self.hand = Hand()
+        self.books = []
+        self.known_cards = {}
+    
     def add_card(self, card: Card) -> None:
         """
         Add a card to the player's hand.
         
         Args:
-            card: The Card object to add
+            card: The card to add
         """
         self.hand.add_card(card)
     
@@ -42,21 +67,19 @@ class Player(ABC):
         Add multiple cards to the player's hand.
         
         Args:
-            cards: List of Card objects to add
+            cards: List of cards to add
         """
         self.hand.add_cards(cards)
     
-    def check_for_books(self) -> List[str]:
+    def check_for_books(self) -> List[int]:
         """
         Check for and remove any books from the player's hand.
         
         Returns:
             List of ranks for which books were found and removed
         """
-        new_books = self.hand.find_books()
-        for book_rank in new_books:
-            self.books.append(book_rank)
-            self.hand.remove_cards_of_rank(book_rank)
+        new_books = [rank_of(book[0]) for book in self.hand.remove_books()]
+        self.books.extend(new_books)
         return new_books
     
     def has_cards(self) -> bool:
@@ -67,7 +90,7 @@ class Player(ABC):
         """Get the player's score (number of books)."""
         return len(self.books)
     
-    def update_knowledge(self, player_name: str, rank: str, has_card: bool) -> None:
+    def update_knowledge(self, player_name: str, rank: int, has_card: bool) -> None:
         """
         Update the player's knowledge about other players' cards.
         
@@ -84,8 +107,31 @@ class Player(ABC):
         elif rank in self.known_cards[player_name]:
             self.known_cards[player_name].remove(rank)
     
+    def join_game(self, game: 'GoFishGame') -> None:
+        """
+        Prepare for a game before the cards are dealt; the default does nothing.
+        
+        Players may keep the game to read public information on their turns:
+        the seating order, hand sizes, books and the number of cards left in
+        the deck.
+        
+        Args:
+            game: The game the player is about to play
+        """
+    
+    def observe_ask(self, asker: str, target: str, rank: int, count: int) -> None:
+        """
+        Observe an ask made by another player; the default does nothing.
+        
+        Args:
+            asker: Name of the player who asked
+            target: Name of the player who was asked
+            rank: The rank that was asked for
+            count: Number of cards handed over, 0 for "Go Fish"
+        """
+    
     @abstractmethod
-    def choose_rank_to_ask_for(self) -> Optional[str]:
+    def choose_rank_to_ask_for(self) -> Optional[int]:
         """
         Choose a rank to ask another player for.
         
@@ -95,12 +141,13 @@ class Player(ABC):
         pass
     
     @abstractmethod
-    def choose_player_to_ask(self, player_names: List[str]) -> str:
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
         """
         Choose a player to ask for a card.
         
         Args:
             player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
             
         Returns:
             The name of the player to ask
@@ -111,7 +158,9 @@ class Player(ABC):
 class RandomPlayer(Player):
     """A player that makes random choices."""
     
-    def choose_rank_to_ask_for(self) -> Optional[str]:
+    strategy_id = 0
+    
+    def choose_rank_to_ask_for(self) -> Optional[int]:
         """
         Choose a random rank from the player's hand.
         
@@ -121,25 +170,28 @@ class RandomPlayer(Player):
         ranks = self.hand.get_ranks()
         if not ranks:
             return None
-        return random.choice(ranks)
+        return self.rng.choice(ranks)
     
-    def choose_player_to_ask(self, player_names: List[str]) -> str:
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
         """
         Choose a random player to ask.
         
         Args:
             player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
             
         Returns:
             A random player name from the list
         """
-        return random.choice(player_names)
+        return self.rng.choice(player_names)
 
 
 class SmartPlayer(Player):
     """A player that makes strategic choices based on known information."""
     
-    def choose_rank_to_ask_for(self) -> Optional[str]:
+    strategy_id = 1
+    
+    def choose_rank_to_ask_for(self) -> Optional[int]:
         """
         Choose a rank to ask for based on the player's hand and knowledge.
         Prioritizes ranks that the player already has multiple cards of.
@@ -150,51 +202,53 @@ class SmartPlayer(Player):
         if not self.has_cards():
             return None
             
-        # Count the occurrences of each rank in the hand
-        rank_counts = {}
-        for card in self.hand.cards:
-            rank_counts[card.rank] = rank_counts.get(card.rank, 0) + 1
-        
-        # Sort ranks by count (descending) to prioritize ranks with more cards
-        sorted_ranks = sorted(rank_counts.keys(), key=lambda r: rank_counts[r], reverse=True)
-        return sorted_ranks[0]
+        # Prioritize the rank the player holds the most cards of
+        rank_counts = self.hand.rank_counts
+        return max(range(len(rank_counts)), key=rank_counts.__getitem__)
     
-    def choose_player_to_ask(self, player_names: List[str]) -> str:
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
         """
         Choose a player to ask based on known information.
         Prioritizes players known to have the rank we're looking for.
         
         Args:
             player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
             
         Returns:
             The chosen player name
         """
-        rank_to_ask = self.choose_rank_to_ask_for()
-        
         # Check if we know any player has the rank we're looking for
         for player_name in player_names:
-            if player_name in self.known_cards and rank_to_ask in self.known_cards[player_name]:
+            if player_name in self.known_cards and rank in self.known_cards[player_name]:
                 return player_name
         
         # Otherwise, choose a random player
-        return random.choice(player_names)
+        return self.rng.choice(player_names)
 
 
 class MemoryPlayer(Player):
     """A player that remembers which cards other players have asked for."""
     
-    def __init__(self, name: str):
+    strategy_id = 2
+    
+    def __init__(self, name: str, rng: Optional[random.Random] = None):
         """
         Initialize a memory player.
         
         Args:
             name: The player's name
+            rng: Random number generator for the player's choices
         """
-        super().__init__(name)
-        self.asked_ranks: Dict[str, Set[str]] = {}  # Ranks that other players have asked for
+        super().__init__(name, rng)
+        self.asked_ranks: Dict[str, Set[int]] = {}  # Ranks that other players have asked for
+    
+    def reset(self) -> None:
+        """Clear the player's state, including remembered asks, before a new game."""
+        super().reset()
+        self.asked_ranks = {}
     
-    def record_ask(self, player_name: str, rank: str) -> None:
+    def record_ask(self, player_name: str, rank: int) -> None:
         """
         Record that a player has asked for a specific rank.
         
@@ -206,7 +260,7 @@ class MemoryPlayer(Player):
             self.asked_ranks[player_name] = set()
         self.asked_ranks[player_name].add(rank)
     
-    def choose_rank_to_ask_for(self) -> Optional[str]:
+    def choose_rank_to_ask_for(self) -> Optional[int]:
         """
         Choose a rank to ask for based on the player's hand and memory.
         
@@ -216,41 +270,558 @@ class MemoryPlayer(Player):
         if not self.has_cards():
             return None
             
-        # Count the occurrences of each rank in the hand
-        rank_counts = {}
-        for card in self.hand.cards:
-            rank_counts[card.rank] = rank_counts.get(card.rank, 0) + 1
-        
-        # Sort ranks by count (descending) to prioritize ranks with more cards
-        sorted_ranks = sorted(rank_counts.keys(), key=lambda r: rank_counts[r], reverse=True)
-        return sorted_ranks[0]
+        # Prioritize the rank the player holds the most cards of
+        rank_counts = self.hand.rank_counts
+        return max(range(len(rank_counts)), key=rank_counts.__getitem__)
     
-    def choose_player_to_ask(self, player_names: List[str]) -> str:
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
         """
         Choose a player to ask based on memory of what they've asked for.
         
         Args:
             player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
             
         Returns:
             The chosen player name
         """
-        rank_to_ask = self.choose_rank_to_ask_for()
-        
         # Check if any player has asked for the rank we're looking for
         for player_name in player_names:
             if (player_name in self.asked_ranks and 
-                rank_to_ask in self.asked_ranks[player_name]):
+                rank in self.asked_ranks[player_name]):
                 return player_name
         
         # Otherwise, choose a random player
-        return random.choice(player_names)
+        return self.rng.choice(player_names)
+
+
+class _SimulatedGame:
+    """
+    A determinized game on rank counts, played forward by MCTSPlayer.
+    
+    The turn rules mirror GoFishGame.play_turn. Suits never matter, so hands
+    are lists of 13 rank counts and the deck is a list of ranks drawn from
+    the end. Every ask is public, so the game also tracks the ranks each
+    player has shown it holds.
+    """
+    
+    __slots__ = ('hands', 'deck', 'books', 'shown', 'current', 'cards_in_hands')
+    
+    def __init__(self, hands: List[List[int]], deck: List[int], books: List[int],
+                 shown: List[Set[int]], current: int):
+        """
+        Initialize a simulated game.
+        
+        Args:
+            hands: Rank counts of each player's hand
+            deck: Ranks of the deck; the last one is drawn first
+            books: Number of books of each player
+            shown: Ranks each player is publicly known to hold
+            current: Seat of the player whose turn it is
+        """
+        self.hands = hands
+        self.deck = deck
+        self.books = books
+        self.shown = shown
+        self.current = current
+        self.cards_in_hands = sum(map(sum, hands))
+    
+    def start_turn(self) -> bool:
+        """
+        Let a current player without cards draw one.
+        
+        Returns:
+            True if the current player can ask, False if they had to pass
+        """
+        hand = self.hands[self.current]
+        if not any(hand):
+            if not self.deck:
+                self.current = (self.current + 1) % len(self.hands)
+                return False
+            hand[self.deck.pop()] += 1
+            self.cards_in_hands += 1
+        return True
+    
+    def ask(self, rank: int, target: int) -> bool:
+        """
+        Play an ask of the current player.
+        
+        Args:
+            rank: The rank asked for
+            target: Seat of the player asked
+            
+        Returns:
+            True if the current player keeps the turn
+        """
+        seat = self.current
+        hand = self.hands[seat]
+        self.shown[seat].add(rank)
+        taken = self.hands[target][rank]
+        if taken:
+            self.hands[target][rank] = 0
+            self.shown[target].discard(rank)
+            hand[rank] += taken
+            if hand[rank] == 4:
+                self._lay_down(seat, rank)
+            return True
+        
+        if self.deck:
+            drawn = self.deck.pop()
+            hand[drawn] += 1
+            self.cards_in_hands += 1
+            if hand[drawn] == 4:
+                self._lay_down(seat, drawn)
+            if drawn == rank:
+                return True
+        self.current = (seat + 1) % len(self.hands)
+        return False
+    
+    def _lay_down(self, seat: int, rank: int) -> None:
+        """Turn the four cards of a rank in a player's hand into a book."""
+        self.hands[seat][rank] = 0
+        self.shown[seat].discard(rank)
+        self.books[seat] += 1
+        self.cards_in_hands -= 4
+    
+    def play_out(self, rng: random.Random, seat: int, max_asks: float) -> None:
+        """
+        Finish a player's turn if it is still going, then play on for a number of asks.
+        
+        A player asks for a rank it holds that another player has shown,
+        and otherwise asks a random player for the rank it holds most.
+        
+        Args:
+            rng: Random number generator for the asks
+            seat: Seat of the player whose turn is finished first
+            max_asks: Number of asks to play after that turn
+                      (math.inf plays the game to the end)
+        """
+        n_players = len(self.hands)
+        # Once the turn has passed on, every ask counts towards max_asks
+        turn = seat if self.current == seat else -1
+        while self.cards_in_hands:
+            if self.current != turn:
+                if max_asks <= 0:
+                    break
+                max_asks -= 1
+                turn = -1
+            if not self.start_turn():
+                continue
+            seat = self.current
+            hand = self.hands[seat]
+            for offset in range(1, n_players):
+                target = (seat + offset) % n_players
+                known = [r for r in self.shown[target] if hand[r]]
+                if known:
+                    rank = known[0]
+                    break
+            else:
+                rank = max(range(13), key=hand.__getitem__)
+                target = (seat + 1 + rng.randrange(n_players - 1)) % n_players
+            self.ask(rank, target)
+    
+    def score(self, seat: int) -> float:
+        """
+        Estimate a player's books, counting a rank held c times as (c/4)^2 of a book.
+        
+        Args:
+            seat: The player's seat
+            
+        Returns:
+            The player's books plus the partial credit for its hand
+        """
+        return self.books[seat] + sum(count * count for count in self.hands[seat]) / 16
+
+
+class MCTSPlayer(Player):
+    """
+    A player that plans its asks with determinized Monte-Carlo tree search.
+    
+    For every search iteration the player deals the cards it cannot see at
+    random, consistent with its own hand, the books on the table, the public
+    hand sizes and what earlier asks revealed, and plays the game forward
+    on that deal. Tree nodes are the player's own decisions within a turn,
+    keyed by what it can observe, so the statistics of a node are shared by
+    every deal, turn and game that reaches it; passing the same tree to
+    several players or games reuses them. Progressive widening opens a new
+    child only once a node has enough visits, and UCB1 picks among the open
+    children that are legal in the current deal, counting how often each
+    was available instead of the node's visits, plus a progressive bias
+    towards asks the player's knowledge favours. Rollouts play on with
+    memory-style asks for every player and score the change in the
+    player's books and partial books; by default they stop at the end of
+    the player's own turn.
+    """
+    
+    def __init__(self, name: str, rng: Optional[random.Random] = None,
+                 shared_tree: Optional[Dict[tuple, list]] = None, iterations: int = 32,
+                 horizon: Optional[int] = 0, bias: float = 1.0,
+                 exploration: float = 0.7, widening: float = 1.0, alpha: float = 0.5,
+                 max_nodes: int = 50000):
+        """
+        Initialize an MCTS player.
+        
+        Args:
+            name: The player's name
+            rng: Random number generator for the player's choices and deals
+            shared_tree: Optional externally owned tree to read and update
+            iterations: Search iterations per decision
+            horizon: Rounds of asks each rollout plays after the player's turn
+                     before it is scored, or None to play the game to the end
+            bias: Weight of the progressive bias towards the favoured asks
+            exploration: UCB1 exploration constant
+            widening: Progressive widening constant C in k = ceil(C * visits^alpha)
+            alpha: Progressive widening exponent
+            max_nodes: Size of the tree beyond which no new nodes are added
+        """
+        super().__init__(name, rng)
+        # Node key -> [visits, {action: [visits, total reward, availability]}]
+        self.tree: Dict[tuple, list] = shared_tree if shared_tree is not None else {}
+        self.iterations = iterations
+        self.horizon = horizon
+        self.bias = bias
+        self.exploration = exploration
+        self.widening = widening
+        self.alpha = alpha
+        self.max_nodes = max_nodes
+        self._reset_game_state()
+    
+    def _reset_game_state(self) -> None:
+        """Forget everything learned about the current game."""
+        self.game = None
+        self._seat = 0
+        # Minimum number of cards of each rank other players are known to hold
+        self._holds: Dict[str, List[int]] = defaultdict(lambda: [0] * len(RANKS))
+        # Ranks other players are known not to hold
+        self._lacks: Dict[str, Set[int]] = defaultdict(set)
+        # Ranks the player's own asks have shown it holds
+        self._shown: Set[int] = set()
+        self._planned: Optional[Tuple[int, str]] = None
+    
+    def reset(self) -> None:
+        """Clear the player's game state; the search tree is kept."""
+        super().reset()
+        self._reset_game_state()
+    
+    def join_game(self, game: 'GoFishGame') -> None:
+        """
+        Remember the game for reading public information during the search.
+        
+        Args:
+            game: The game the player is about to play
+        """
+        self.game = game
+        self._seat = game.players.index(self)
+    
+    def update_knowledge(self, player_name: str, rank: int, has_card: bool) -> None:
+        """
+        Update the player's knowledge after its own ask.
+        
+        Args:
+            player_name: The name of the player to update knowledge about
+            rank: The rank that was asked for
+            has_card: Whether the player has the card or not
+        """
+        super().update_knowledge(player_name, rank, has_card)
+        self._shown.add(rank)
+        # Either way the asked player has no cards of the rank left
+        self._holds[player_name][rank] = 0
+        self._lacks[player_name].add(rank)
+    
+    def observe_ask(self, asker: str, target: str, rank: int, count: int) -> None:
+        """
+        Learn from an ask made by another player.
+        
+        Args:
+            asker: Name of the player who asked
+            target: Name of the player who was asked
+            rank: The rank that was asked for
+            count: Number of cards handed over, 0 for "Go Fish"
+        """
+        # Asking shows the asker held the rank, and it now holds any cards handed over
+        holds = self._holds[asker]
+        holds[rank] = max(holds[rank], 1) + count
+        if not count:
+            # The asker drew a card the player has not seen
+            self._lacks[asker].clear()
+        if target != self.name:
+            self._holds[target][rank] = 0
+            self._lacks[target].add(rank)
+        elif count:
+            self._shown.discard(rank)
+    
+    def _root_key(self) -> tuple:
+        """
+        Build the tree key of the current decision from what the player knows.
+        
+        The key holds the player's hand, the books, hand sizes and deck size
+        as seen from its seat, and what it has learned about each opponent.
+        """
+        players = self.game.players
+        order = players[self._seat:] + players[:self._seat]
+        knowledge = tuple((tuple(self._holds[p.name]), tuple(sorted(self._lacks[p.name])))
+                          for p in order[1:])
+        return (tuple(self.hand.rank_counts), tuple(len(p.books) for p in order),
+                tuple(len(p.hand) for p in order), len(self.game.deck), knowledge)
+    
+    def _deal_unseen(self) -> _SimulatedGame:
+        """
+        Deal the cards the player cannot see into a game it can play forward.
+        
+        Returns:
+            A simulated game consistent with everything the player knows
+        """
+        players = self.game.players
+        rng = self.rng
+        own = list(self.hand.rank_counts)
+        unseen = [4 - count for count in own]
+        for player in players:
+            for rank in player.books:
+                unseen[rank] = 0
+        
+        hands = [None] * len(players)
+        hands[self._seat] = own
+        opponents = [seat for seat in range(len(players)) if seat != self._seat]
+        rng.shuffle(opponents)
+        
+        # First give every opponent the cards its asks revealed
+        for seat in opponents:
+            hand = hands[seat] = [0] * len(RANKS)
+            slots = len(players[seat].hand)
+            for rank, count in enumerate(self._holds[players[seat].name]):
+                count = min(count, unseen[rank], slots, 3)
+                hand[rank] = count
+                unseen[rank] -= count
+                slots -= count
+        
+        # Then fill the hands from the rest, avoiding ranks a player is known not to hold
+        pool = [rank for rank, count in enumerate(unseen) for _ in range(count)]
+        rng.shuffle(pool)
+        for seat in opponents:
+            hand = hands[seat]
+            lacks = self._lacks[players[seat].name]
+            slots = len(players[seat].hand) - sum(hand)
+            # Knowledge can go stale, so if a hand is still short drop the
+            # lacked ranks, and as a last resort the limit of 3 per rank
+            for allowed in (lambda rank: rank not in lacks and hand[rank] < 3,
+                            lambda rank: hand[rank] < 3,
+                            lambda rank: True):
+                rest = []
+                for rank in pool:
+                    if slots and allowed(rank):
+                        hand[rank] += 1
+                        slots -= 1
+                    else:
+                        rest.append(rank)
+                pool = rest
+                if not slots:
+                    break
+        self._trade_fours(hands, pool, opponents)
+        
+        shown = [{rank for rank, count in enumerate(self._holds[player.name]) if count}
+                 for player in players]
+        shown[self._seat] = {rank for rank in self._shown if own[rank]}
+        books = [len(player.books) for player in players]
+        return _SimulatedGame(hands, pool, books, shown, self._seat)
+    
+    @staticmethod
+    def _trade_fours(hands: List[List[int]], deck: List[int], opponents: List[int]) -> None:
+        """
+        Swap away the fourth card of any rank a greedy deal left in a hand.
+        
+        A real hand never holds four of a rank, so each such card is traded
+        for a card of the deck, or of another opponent, that breaks no limit.
+        
+        Args:
+            hands: Rank counts of each player's hand, changed in place
+            deck: Ranks left in the deck, changed in place
+            opponents: Seats whose hands were dealt
+        """
+        for seat in opponents:
+            hand = hands[seat]
+            for rank in range(len(RANKS)):
+                if hand[rank] < 4:
+                    continue
+                for index, other in enumerate(deck):
+                    if hand[other] < 3:
+                        deck[index] = rank
+                        break
+                else:
+                    for other_seat in opponents:
+                        other_hand = hands[other_seat]
+                        if other_seat == seat or other_hand[rank] >= 3:
+                            continue
+                        other = next((other for other in range(len(RANKS))
+                                      if other_hand[other] and hand[other] < 3), None)
+                        if other is not None:
+                            other_hand[other] -= 1
+                            other_hand[rank] += 1
+                            break
+                    else:
+                        continue
+                hand[rank] -= 1
+                hand[other] += 1
+    
+    def _select(self, key: tuple,
+                actions: List[Tuple[int, int]]) -> Tuple[list, Tuple[int, int], bool]:
+        """
+        Pick an action at a tree node with UCB1 and progressive widening.
+        
+        Args:
+            key: The node's key in the tree
+            actions: Legal actions in the current deal, as (rank, seat offset),
+                     most promising first
+            
+        Returns:
+            Tuple of (node, chosen action, whether the action was newly opened)
+        """
+        node = self.tree.get(key)
+        if node is None:
+            node = [0, {}]
+            if len(self.tree) < self.max_nodes:
+                self.tree[key] = node
+        visits, children = node
+        
+        # Open another child while the node has fewer than k = ceil(C * visits^alpha),
+        # taking actions in the order given
+        available = [action for action in actions if action in children]
+        limit = math.ceil(self.widening * max(visits, 1) ** self.alpha)
+        if len(available) < len(actions) and (not available or len(children) < limit):
+            for action in actions:
+                if action not in children:
+                    children[action] = [0, 0.0, 0]
+                    return node, action, True
+        
+        best_action = None
+        best_score = -math.inf
+        for order, action in enumerate(actions):
+            edge = children.get(action)
+            if edge is None:
+                continue
+            edge[2] += 1
+            if edge[0] == 0:
+                score = math.inf
+            else:
+                # Progressive bias: the ordering counts for less as the edge gathers visits
+                explore = math.sqrt(math.log(edge[2]) / edge[0])
+                score = (edge[1] / edge[0] + self.exploration * explore
+                         + self.bias / ((order + 1) * (edge[0] + 1)))
+            if score > best_score:
+                best_action = action
+                best_score = score
+        return node, best_action, False
+    
+    def _ordered_actions(self, hand: List[int]) -> List[Tuple[int, int]]:
+        """
+        List the asks a hand allows, most promising first.
+        
+        Asks for a rank the player is known to hold come first, then asks
+        that are not known to fail; ties go to the rank held most often.
+        
+        Args:
+            hand: Rank counts of the player's hand
+            
+        Returns:
+            Actions as (rank, seat offset) pairs
+        """
+        players = self.game.players
+        n_players = len(players)
+        prior = []
+        for offset in range(1, n_players):
+            name = players[(self._seat + offset) % n_players].name
+            holds = self._holds[name]
+            lacks = self._lacks[name]
+            for rank in range(len(RANKS)):
+                if hand[rank]:
+                    prior.append(((holds[rank] > 0, rank not in lacks, hand[rank]), (rank, offset)))
+        prior.sort(key=lambda item: item[0], reverse=True)
+        return [action for _, action in prior]
+    
+    def _search(self) -> Tuple[int, int]:
+        """
+        Run the search from the current decision.
+        
+        Returns:
+            The most visited legal action at the root, as (rank, seat offset)
+        """
+        players = self.game.players
+        n_players = len(players)
+        seat = self._seat
+        root_key = self._root_key()
+        max_asks = math.inf if self.horizon is None else self.horizon * n_players
+        start_score = len(self.books) + sum(count * count for count in self.hand.rank_counts) / 16
+        
+        for _ in range(self.iterations):
+            sim = self._deal_unseen()
+            key = root_key
+            path = []
+            while True:
+                node, action, opened = self._select(key, self._ordered_actions(sim.hands[seat]))
+                path.append((node, action))
+                rank, offset = action
+                if not sim.ask(rank, (seat + offset) % n_players) or not sim.cards_in_hands:
+                    break
+                if opened or not sim.start_turn():
+                    break
+                # The player's next decision is told apart by what the ask brought in
+                key = (key, action, tuple(sim.hands[seat]))
+            
+            sim.play_out(self.rng, seat, max_asks)
+            reward = sim.score(seat) - start_score
+            for node, action in path:
+                node[0] += 1
+                edge = node[1][action]
+                edge[0] += 1
+                edge[1] += reward
+        
+        children = self.tree.get(root_key, [0, {}])[1]
+        # Ties go to the most promising action
+        return max(self._ordered_actions(self.hand.rank_counts),
+                   key=lambda action: children.get(action, (0,))[0])
+    
+    def choose_rank_to_ask_for(self) -> Optional[int]:
+        """
+        Choose a rank to ask for, planning the whole ask with the search.
+        
+        Outside a game the player has nothing to search with and asks for a
+        random rank.
+        
+        Returns:
+            The chosen rank, or None if the hand is empty
+        """
+        ranks = self.hand.get_ranks()
+        if not ranks:
+            return None
+        if self.game is None:
+            return self.rng.choice(ranks)
+        
+        rank, offset = self._search()
+        target = self.game.players[(self._seat + offset) % len(self.game.players)]
+        self._planned = (rank, target.name)
+        return rank
+    
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
+        """
+        Choose the player the search planned to ask.
+        
+        Args:
+            player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
+            
+        Returns:
+            The chosen player name
+        """
+        planned = self._planned
+        self._planned = None
+        if planned is not None and planned[0] == rank and planned[1] in player_names:
+            return planned[1]
+        return self.rng.choice(player_names)
 
 
 class HumanPlayer(Player):
     """A player controlled by a human user."""
     
-    def choose_rank_to_ask_for(self) -> Optional[str]:
+    def choose_rank_to_ask_for(self) -> Optional[int]:
         """
         Ask the human user which rank to ask for.
         
@@ -262,14 +833,12 @@ class HumanPlayer(Player):
             
         # Display the player's hand
         print(f"\nYour hand:")
-        ranks = {}
+        ranks = defaultdict(list)
         for card in self.hand.cards:
-            if card.rank not in ranks:
-                ranks[card.rank] = []
-            ranks[card.rank].append(card)
+            ranks[rank_of(card)].append(card)
         
         for rank, cards in ranks.items():
-            print(f"{rank}: {', '.join(str(card) for card in cards)}")
+            print(f"{RANKS[rank]}: {', '.join(card_str(card) for card in cards)}")
         
         # Ask the user which rank to ask for
         while True:
@@ -279,17 +848,18 @@ class HumanPlayer(Player):
             elif len(rank) == 1:
                 rank = rank.upper()  # Convert single character to uppercase
             
-            if rank in self.hand.get_ranks():
-                return rank
+            if rank in RANKS and self.hand.has_rank(RANKS.index(rank)):
+                return RANKS.index(rank)
             else:
                 print("You must ask for a rank that you have in your hand.")
     
-    def choose_player_to_ask(self, player_names: List[str]) -> str:
+    def choose_player_to_ask(self, player_names: List[str], rank: int) -> str:
         """
         Ask the human user which player to ask.
         
         Args:
             player_names: List of other players' names
+            rank: The rank the player has chosen to ask for
             
         Returns:
             The chosen player name
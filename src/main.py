@@ -6,14 +6,52 @@ This script provides a command-line interface to run Go Fish simulations
 with various player types and configurations.
 """
 import argparse
+import functools
+import io
+import os
 import random
 import sys
-from typing import List, Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, TextIO
 
 from gofish.cards import Card, Deck
-from gofish.player import Player, RandomPlayer, SmartPlayer, MemoryPlayer, HumanPlayer
+from gofish.player import Player, RandomPlayer, SmartPlayer, MemoryPlayer, MCTSPlayer, HumanPlayer
 from gofish.game import GoFishGame
 
+# Player classes for each AI player type accepted by --player-types
+PLAYER_TYPES = {
+    'random': RandomPlayer,
+    'smart': SmartPlayer,
+    'memory': MemoryPlayer,
+    'mcts': MCTSPlayer,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _name(kind: str, number: int) -> str:
+    """Return the interned name of the numbered player of the given type."""
+    # Players are named after their class, e.g. MCTSPlayer -> MCTS-1
+    return sys.intern(f"{PLAYER_TYPES[kind].__name__[:-len('Player')]}-{number}")
+
+
+def _parse_player_types(value: str) -> List[str]:
+    """
+    Parse and validate the --player-types argument.
+    
+    Args:
+        value: Comma-separated list of player types
+        
+    Returns:
+        List of player type names
+    """
+    player_types = value.split(',')
+    invalid = [pt for pt in player_types if pt not in PLAYER_TYPES]
+    if invalid:
+        raise argparse.ArgumentTypeError(
+            f"invalid player type '{invalid[0]}'. Valid types are: {', '.join(PLAYER_TYPES)}")
+    return player_types
+
 
 def parse_args():
     """Parse command-line arguments."""
@@ -54,9 +92,9 @@ def parse_args():
     
     parser.add_argument(
         '--player-types',
-        type=str,
+        type=_parse_player_types,
         default='random',
-        help='Comma-separated list of player types: random, smart, memory (default: random)'
+        help='Comma-separated list of player types: random, smart, memory, mcts (default: random)'
     )
     
     parser.add_argument(
@@ -69,25 +107,21 @@ def parse_args():
     return parser.parse_args()
 
 
-def create_players(args) -> List[Player]:
+def create_players(args,
+                   player_options: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Player]:
     """
     Create players based on command-line arguments.
     
     Args:
         args: Command-line arguments
+        player_options: Extra constructor arguments for each player type
         
     Returns:
         List of Player objects
     """
+    player_options = player_options or {}
     players = []
-    player_types = args.player_types.split(',')
-    
-    # Validate player types
-    valid_types = {'random', 'smart', 'memory'}
-    for pt in player_types:
-        if pt not in valid_types:
-            print(f"Error: Invalid player type '{pt}'. Valid types are: {', '.join(valid_types)}")
-            sys.exit(1)
+    player_types = args.player_types
     
     # Create human player if requested
     if args.human:
@@ -97,17 +131,74 @@ def create_players(args) -> List[Player]:
     num_ai_players = args.players - (1 if args.human else 0)
     for i in range(num_ai_players):
         player_type = player_types[i % len(player_types)]
-        
-        if player_type == 'random':
-            players.append(RandomPlayer(f"Random-{i+1}"))
-        elif player_type == 'smart':
-            players.append(SmartPlayer(f"Smart-{i+1}"))
-        elif player_type == 'memory':
-            players.append(MemoryPlayer(f"Memory-{i+1}"))
+        players.append(PLAYER_TYPES[player_type](_name(player_type, i + 1),
+                                                 **player_options.get(player_type, {})))
     
     return players
 
 
+def _play_one_game(players: List[Player], initial_cards: int, verbose: bool, seed: int,
+                   out: Optional[TextIO] = None) -> List[str]:
+    """
+    Play a single game of a simulation.
+    
+    Args:
+        players: Players to reuse for this game; their state is reset first
+        initial_cards: Number of cards to deal to each player initially
+        verbose: Whether to print game progress messages
+        seed: Random seed for this game
+        out: Stream for game progress messages (default: sys.stdout)
+        
+    Returns:
+        Names of the players who won the game
+    """
+    for player in players:
+        player.reset()
+    
+    # Initialize and run the game
+    game = GoFishGame(
+        players=players,
+        initial_cards=initial_cards,
+        verbose=verbose,
+        use_compiled=not verbose,  # quiet games play identically on the compiled core
+        out=out,
+        rng=random.Random(seed)
+    )
+    
+    return [winner.name for winner in game.play_game()]
+
+
+# Players and settings of a simulation worker process, set up by _init_worker
+_worker_players: List[Player] = []
+_worker_initial_cards = 0
+
+
+def _init_worker(args_dict: Dict[str, Any]) -> None:
+    """
+    Create the players a simulation worker process reuses for all its games.
+    
+    Args:
+        args_dict: Command-line arguments as a dictionary
+    """
+    global _worker_players, _worker_initial_cards
+    args = argparse.Namespace(**args_dict)
+    _worker_players = create_players(args)
+    _worker_initial_cards = args.initial_cards
+
+
+def _play_worker_game(seed: int) -> List[str]:
+    """
+    Play a quiet game in a simulation worker process.
+    
+    Args:
+        seed: Random seed for this game
+        
+    Returns:
+        Names of the players who won the game
+    """
+    return _play_one_game(_worker_players, _worker_initial_cards, False, seed)
+
+
 def run_simulation(args):
     """
     Run a Go Fish simulation with the specified parameters.
@@ -115,44 +206,55 @@ def run_simulation(args):
     Args:
         args: Command-line arguments
     """
-    # Set random seed if provided
-    if args.seed is not None:
-        random.seed(args.seed)
+    # Give every game its own random stream so results do not depend on how
+    # games are scheduled, without touching the global random state
+    rng = random.Random(args.seed)
+    seeds = [rng.randrange(2**63) for _ in range(args.games)]
+    
+    # Create the players once; each game resets and reuses them, and MCTS
+    # players keep building one shared search tree across all games
+    players = create_players(args, {'mcts': {'shared_tree': {}}})
     
     # Track statistics across multiple games
-    win_counts = {}
+    win_counts = Counter()
     
-    for game_num in range(args.games):
-        if args.games > 1 and not args.quiet:
-            print(f"\n=== Game {game_num + 1} of {args.games} ===\n")
-        
-        # Create players for this game
-        players = create_players(args)
-        
-        # Initialize and run the game
-        game = GoFishGame(
-            players=players,
-            initial_cards=args.initial_cards,
-            verbose=not args.quiet
-        )
-        
-        winners = game.play_game()
-        
-        # Update win statistics
-        for winner in winners:
-            win_counts[winner.name] = win_counts.get(winner.name, 0) + 1
+    # Quiet games without a human player are independent, so spread them over
+    # all cores; MCTS players learn from game to game, so their games stay in order
+    learning = any(isinstance(player, MCTSPlayer) for player in players)
+    if args.quiet and not args.human and not learning and args.games >= 4:
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(vars(args),)) as executor:
+            results = list(executor.map(
+                _play_worker_game,
+                seeds,
+                chunksize=max(1, args.games // (4 * workers))
+            ))
+    else:
+        results = []
+        for game_num in range(args.games):
+            # Collect each game's messages and write them at once, unless a
+            # human player needs to see them as the game goes
+            out = sys.stdout if args.human else io.StringIO()
+            if args.games > 1 and not args.quiet:
+                out.write(f"\n=== Game {game_num + 1} of {args.games} ===\n\n")
+            results.append(_play_one_game(players, args.initial_cards, not args.quiet,
+                                          seeds[game_num], out))
+            if out is not sys.stdout:
+                sys.stdout.write(out.getvalue())
+    
+    # Update win statistics
+    for winner_names in results:
+        win_counts.update(winner_names)
     
     # Print overall statistics for multiple games
     if args.games > 1:
-        print("\n=== Final Statistics ===")
-        print(f"Total games: {args.games}")
-        print("\nWin counts:")
-        
         # Sort by win count (descending)
-        sorted_wins = sorted(win_counts.items(), key=lambda x: x[1], reverse=True)
-        for name, count in sorted_wins:
-            win_percentage = (count / args.games) * 100
-            print(f"{name}: {count} wins ({win_percentage:.1f}%)")
+        to_percent = 100.0 / args.games
+        lines = [f"{name}: {count} wins ({count * to_percent:.1f}%)"
+                 for name, count in win_counts.most_common()]
+        sys.stdout.write("\n=== Final Statistics ===\nTotal games: {}\n\nWin counts:\n{}\n".format(
+            args.games, "\n".join(lines)))
 
 
 def main():
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the Go Fish simulator tests.
+"""
+import os
+import sys
+
+import pytest
+
+# The gofish package lives in src/, next to main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from gofish.cards import Deck
+from gofish.player import RandomPlayer, SmartPlayer, MemoryPlayer, MCTSPlayer
+
+
+def pytest_configure(config):
+    """Register the markers used by the test suite."""
+    config.addinivalue_line("markers", "slow: plays complete games; skip with -m 'not slow'")
+
+
+@pytest.fixture
+def fresh_deck():
+    """A shuffled standard deck; tests draw from it, so each gets its own."""
+    deck = Deck()
+    deck.shuffle()
+    return deck
+
+
+@pytest.fixture(params=[RandomPlayer, SmartPlayer, MemoryPlayer, MCTSPlayer],
+                ids=lambda cls: cls.__name__)
+def player_class(request):
+    """Each AI player class in turn."""
+    return request.param
@@ -0,0 +1,52 @@
+"""
+Tests for the batched NumPy simulation.
+"""
+import random
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gofish.batch import batch_simulate
+from gofish.game import GoFishGame
+from gofish.player import RandomPlayer
+
+
+@pytest.mark.parametrize("strategy", ["random", "smart"])
+@pytest.mark.parametrize("initial_cards", [0, 1, 7, 20])
+def test_every_game_lays_down_all_books(strategy, initial_cards):
+    """Every game is played until all 13 books are down."""
+    books = batch_simulate(200, n_players=3, strategy=strategy,
+                           initial_cards=initial_cards, seed=1)
+    assert books.shape == (200, 3)
+    assert (books.sum(axis=1) == 13).all()
+
+
+def test_seed_reproduces_games():
+    """The same seed plays the same games."""
+    assert (batch_simulate(100, seed=4) == batch_simulate(100, seed=4)).all()
+
+
+def test_invalid_arguments():
+    """Too few players and unknown strategies are rejected."""
+    with pytest.raises(ValueError):
+        batch_simulate(10, n_players=1)
+    with pytest.raises(ValueError):
+        batch_simulate(10, strategy="memory")
+
+
+@pytest.mark.slow
+def test_statistics_match_python_game():
+    """Mean books per seat agree with games played by GoFishGame."""
+    batch_books = batch_simulate(2000, n_players=3, strategy="random", seed=2)
+    
+    python_books = []
+    for seed in range(400):
+        players = [RandomPlayer(f"Random-{i + 1}") for i in range(3)]
+        game = GoFishGame(players, verbose=False, use_compiled=False, rng=random.Random(seed))
+        game.play_game()
+        python_books.append([len(player.books) for player in players])
+    
+    for seat, mean_books in enumerate(map(statistics.mean, zip(*python_books))):
+        assert batch_books[:, seat].mean() == pytest.approx(mean_books, abs=0.5)
@@ -0,0 +1,82 @@
+"""
+Tests for cards, decks and hands.
+"""
+import random
+
+import pytest
+
+from gofish.cards import Deck, Hand, card_str, make_card, rank_of
+
+
+def test_new_deck_has_52_cards():
+    """A new deck holds one card of every rank and suit."""
+    deck = Deck()
+    assert len(deck) == 52
+    assert len(set(deck.cards)) == 52
+
+
+def test_draw_multiple(fresh_deck):
+    """Drawing several cards removes them from the deck."""
+    cards = fresh_deck.draw_multiple(5)
+    assert len(cards) == 5
+    assert len(fresh_deck) == 47
+    assert not set(cards) & set(fresh_deck.cards)
+
+
+@pytest.mark.parametrize("count", [1, 5, 52])
+def test_draw_multiple_matches_repeated_draws(count):
+    """draw_multiple(n) returns the cards n calls to draw() would, in the same order."""
+    deck = Deck(shuffled=True, rng=random.Random(3))
+    copy = Deck(cards=deck.cards)
+    
+    assert deck.draw_multiple(count) == [copy.draw() for _ in range(count)]
+    assert deck.cards == copy.cards
+
+
+def test_draw_multiple_edge_cases():
+    """Drawing stops at the bottom of the deck and never draws a negative count."""
+    deck = Deck(shuffled=True, rng=random.Random(4))
+    top = deck.cards[-1]
+    
+    assert deck.draw_multiple(0) == [] and deck.draw_multiple(-3) == []
+    assert len(deck) == 52
+    cards = deck.draw_multiple(60)
+    assert len(cards) == 52 and cards[0] == top
+    assert deck.is_empty()
+    assert deck.draw_multiple(1) == []
+    assert deck.draw() is None
+
+
+def test_added_cards_go_to_the_bottom():
+    """Added cards are drawn after the rest of the deck, first given first."""
+    ace, king, queen, jack = (make_card(rank, "Spades") for rank in ("A", "K", "Q", "J"))
+    deck = Deck(cards=[])
+    deck.add_card(ace)
+    deck.add_cards([king, queen])
+    deck.add_card(jack)
+    
+    assert [deck.draw() for _ in range(4)] == [ace, king, queen, jack]
+    assert deck.draw() is None
+
+
+def test_card_equality():
+    """Cards are equal when rank and suit match."""
+    card1 = make_card("A", "Spades")
+    card2 = make_card("A", "Spades")
+    card3 = make_card("A", "Hearts")
+    
+    assert card1 == card2
+    assert card1 != card3
+    assert rank_of(card1) == rank_of(card3)
+    assert card_str(card1) == "A of Spades"
+
+
+def test_hand_books():
+    """Four cards of a rank form a book that is removed from the hand."""
+    hand = Hand()
+    hand.add_cards([make_card("7", suit) for suit in ("Hearts", "Diamonds", "Clubs", "Spades")])
+    hand.add_card(make_card("K", "Hearts"))
+    
+    books = hand.remove_books()
+    assert [rank_of(book[0]) for book in books] == [rank_of(make_card("7", "Hearts"))]
+    assert hand.cards == [make_card("K", "Hearts")]
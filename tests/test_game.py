@@ -0,0 +1,92 @@
+"""
+Tests for the game loop.
+"""
+import io
+import random
+
+import pytest
+
+from gofish.game import GoFishGame
+from gofish.player import RandomPlayer, SmartPlayer, MemoryPlayer
+
+
+@pytest.mark.slow
+def test_basic_game():
+    """A verbose game with 4 players of different types plays to the end."""
+    players = [
+        RandomPlayer("Random-1"),
+        SmartPlayer("Smart-1"),
+        MemoryPlayer("Memory-1"),
+        RandomPlayer("Random-2")
+    ]
+    out = io.StringIO()
+    game = GoFishGame(players=players, initial_cards=5, verbose=True, out=out,
+                      rng=random.Random(42))
+    winners = game.play_game()
+    
+    assert game.game_over
+    assert winners
+    assert sum(len(player.books) for player in players) == 13
+    assert out.getvalue()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("use_compiled", [False, True], ids=["python", "compiled"])
+def test_seeded_games_repeat(use_compiled):
+    """Games played with the same seed have the same outcome."""
+    if use_compiled:
+        pytest.importorskip("gofish._sim_numba")
+    
+    def play(seed):
+        players = [RandomPlayer("Random-1"), SmartPlayer("Smart-1"), MemoryPlayer("Memory-1")]
+        game = GoFishGame(players=players, verbose=False, use_compiled=use_compiled,
+                          rng=random.Random(seed))
+        assert (game._find_compiled_core() is not None) == use_compiled
+        winners = game.play_game()
+        return ([sorted(player.books) for player in players], [player.name for player in winners],
+                game.turn_count)
+    
+    for seed in range(20):
+        assert play(seed) == play(seed)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("initial_cards", [0, 1, 7, 20])
+def test_compiled_games_match_python(initial_cards):
+    """The compiled core plays every game exactly as the Python loop does."""
+    pytest.importorskip("gofish._sim_numba")
+    
+    def play(seed, use_compiled):
+        players = [RandomPlayer("Random-1"), SmartPlayer("Smart-1"), MemoryPlayer("Memory-1")]
+        rng = random.Random(seed)
+        game = GoFishGame(players=players, initial_cards=initial_cards, verbose=False,
+                          use_compiled=use_compiled, rng=rng)
+        assert (game._find_compiled_core() is not None) == use_compiled
+        winners = game.play_game()
+        return ([sorted(player.books) for player in players], game.turn_count,
+                [player.name for player in winners], rng.random())
+    
+    for seed in range(100):
+        assert play(seed, True) == play(seed, False)
+
+
+def test_compiled_core_respects_overrides():
+    """Subclassed players and games are always played by the Python loop."""
+    class CountingSmartPlayer(SmartPlayer):
+        calls = 0
+        
+        def choose_rank_to_ask_for(self):
+            CountingSmartPlayer.calls += 1
+            return super().choose_rank_to_ask_for()
+    
+    class BrokenGame(GoFishGame):
+        def play_turn(self):
+            raise RuntimeError("custom rules")
+    
+    players = [CountingSmartPlayer("Counting"), RandomPlayer("Random")]
+    GoFishGame(players, verbose=False, use_compiled=True, rng=random.Random(1)).play_game()
+    assert CountingSmartPlayer.calls > 0
+    
+    players = [RandomPlayer("Random-1"), RandomPlayer("Random-2")]
+    with pytest.raises(RuntimeError):
+        BrokenGame(players, verbose=False, use_compiled=True, rng=random.Random(1)).play_game()
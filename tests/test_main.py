@@ -0,0 +1,78 @@
+"""
+Tests for the command-line entry point.
+"""
+import argparse
+import re
+
+import pytest
+
+import main
+from gofish.player import MCTSPlayer
+
+
+def make_args(**overrides):
+    """Command-line arguments with the defaults of main.py."""
+    args = dict(games=1, players=4, initial_cards=7, human=False, quiet=True,
+                player_types=['random'], seed=None)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_players_are_named_after_their_class():
+    """create_players builds every type from PLAYER_TYPES and numbers the players."""
+    tree = {}
+    players = main.create_players(make_args(players=3, player_types=['mcts', 'smart']),
+                                  {'mcts': {'shared_tree': tree}})
+    
+    assert [player.name for player in players] == ["MCTS-1", "Smart-2", "MCTS-3"]
+    assert players[0].tree is tree and players[2].tree is tree
+    assert isinstance(players[2], MCTSPlayer)
+
+
+def final_statistics(output):
+    """The final statistics section of a simulation's output."""
+    return output[output.index("=== Final Statistics ==="):]
+
+
+def test_player_types_are_validated(monkeypatch):
+    """--player-types accepts known types and rejects anything else."""
+    assert main._parse_player_types("random,mcts") == ['random', 'mcts']
+    with pytest.raises(argparse.ArgumentTypeError, match="invalid player type 'clever'"):
+        main._parse_player_types("smart,clever")
+    
+    monkeypatch.setattr("sys.argv", ["main.py", "--player-types", "smart,memory", "--quiet"])
+    args = main.parse_args()
+    assert args.player_types == ['smart', 'memory'] and args.quiet
+    
+    monkeypatch.setattr("sys.argv", ["main.py", "--player-types", "clever"])
+    with pytest.raises(SystemExit):
+        main.parse_args()
+
+
+def test_final_statistics_report(capsys):
+    """The report lists every winner by descending number of wins."""
+    main.run_simulation(make_args(games=3, players=3, player_types=['random', 'smart'], seed=5))
+    output = capsys.readouterr().out
+    
+    report = final_statistics(output).splitlines()
+    assert report[:4] == ["=== Final Statistics ===", "Total games: 3", "", "Win counts:"]
+    lines = [re.fullmatch(r"(\S+): (\d+) wins \((\d+\.\d)%\)", line) for line in report[4:]]
+    assert lines and all(lines)
+    wins = [int(line.group(2)) for line in lines]
+    assert wins == sorted(wins, reverse=True) and sum(wins) >= 3
+    assert [line.group(3) for line in lines] == [f"{100 * count / 3:.1f}" for count in wins]
+
+
+@pytest.mark.slow
+def test_parallel_games_match_sequential(capsys):
+    """Quiet games spread over worker processes give the results of a sequential run."""
+    args = make_args(games=8, players=3, player_types=['random', 'smart', 'memory'], seed=11)
+    main.run_simulation(args)
+    parallel = capsys.readouterr().out
+    
+    # Verbose games are always played in order by the Python loop
+    args.quiet = False
+    main.run_simulation(args)
+    sequential = capsys.readouterr().out
+    
+    assert final_statistics(parallel) == final_statistics(sequential)
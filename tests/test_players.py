@@ -0,0 +1,188 @@
+"""
+Tests for the AI player strategies.
+"""
+import random
+
+import pytest
+
+from gofish.game import GoFishGame
+from gofish.player import RandomPlayer, SmartPlayer, MemoryPlayer, MCTSPlayer, _SimulatedGame
+
+
+def test_strategy_choices(player_class, fresh_deck):
+    """Every strategy asks another player for a rank it holds."""
+    player = player_class(player_class.__name__)
+    player.add_cards(fresh_deck.draw_multiple(5))
+    other_players = ["Player1", "Player2", "Player3"]
+    
+    rank = player.choose_rank_to_ask_for()
+    assert player.hand.has_rank(rank)
+    assert player.choose_player_to_ask(other_players, rank) in other_players
+
+
+def test_empty_hand_asks_for_nothing(player_class):
+    """A player without cards has no rank to ask for."""
+    assert player_class(player_class.__name__).choose_rank_to_ask_for() is None
+
+
+def test_reset_clears_game_state(fresh_deck):
+    """reset() empties the hand, books and knowledge between games."""
+    player = RandomPlayer("Random")
+    player.add_cards(fresh_deck.draw_multiple(5))
+    player.update_knowledge("Player1", 3, True)
+    
+    player.reset()
+    assert not player.has_cards()
+    assert player.books == []
+    assert player.known_cards == {}
+
+
+def test_subclasses_do_not_inherit_strategy_id():
+    """Only the built-in strategies claim a compiled counterpart."""
+    class CustomSmartPlayer(SmartPlayer):
+        def choose_rank_to_ask_for(self):
+            return super().choose_rank_to_ask_for()
+    
+    assert [RandomPlayer.strategy_id, SmartPlayer.strategy_id, MemoryPlayer.strategy_id] == [0, 1, 2]
+    assert CustomSmartPlayer.strategy_id is None
+
+
+def test_mcts_learns_from_asks():
+    """Asks update what an MCTS player knows about the other players."""
+    player = MCTSPlayer("MCTS")
+    player.update_knowledge("Player1", 3, True)
+    player.observe_ask("Player2", "Player1", 5, 2)
+    
+    assert player._shown == {3}
+    assert 3 in player._lacks["Player1"] and 5 in player._lacks["Player1"]
+    assert player._holds["Player2"][5] == 3
+    
+    # A miss means Player2 drew an unseen card, which may be anything
+    player.update_knowledge("Player2", 7, False)
+    player.observe_ask("Player2", "Player3", 8, 0)
+    assert not player._lacks["Player2"]
+
+
+@pytest.mark.slow
+def test_mcts_tree_survives_reset():
+    """The shared search tree grows over a game and is kept by reset()."""
+    tree = {}
+    player = MCTSPlayer("MCTS-1", rng=random.Random(1), shared_tree=tree, iterations=8)
+    players = [player, RandomPlayer("Random-1", rng=random.Random(2))]
+    game = GoFishGame(players=players, verbose=False, rng=random.Random(3))
+    game.play_game()
+    
+    assert sum(len(p.books) for p in players) == 13
+    assert tree and player.tree is tree
+    size = len(tree)
+    
+    player.reset()
+    assert player.tree is tree and len(tree) == size
+    assert player.game is None and not player._holds and not player._shown
+
+
+class RecordingGame(_SimulatedGame):
+    """A simulated game that records the seat of every ask."""
+    
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.askers = []
+    
+    def ask(self, rank, target):
+        self.askers.append(self.current)
+        return super().ask(rank, target)
+
+
+def simulated_game(hands, deck, current=0):
+    """A recording simulated game with no books and nothing shown yet."""
+    return RecordingGame(hands, deck, [0] * len(hands), [set() for _ in hands], current)
+
+
+def counts(*ranks):
+    """Rank counts of a hand holding the given ranks."""
+    hand = [0] * 13
+    for rank in ranks:
+        hand[rank] += 1
+    return hand
+
+
+def test_simulated_game_turn_rules():
+    """Hits and lucky draws keep the turn, misses pass it on, and fours become books."""
+    sim = simulated_game([counts(1, 1, 1, 2), counts(1, 3), counts(4)], [5, 2, 4])
+    
+    # A hit completes the book and keeps the turn
+    assert sim.ask(1, 1)
+    assert sim.books == [1, 0, 0] and sim.hands[0] == counts(2) and sim.hands[1] == counts(3)
+    assert sim.cards_in_hands == 3 and sim.shown[0] == set()
+    
+    # Drawing the asked rank keeps the turn, anything else passes it on
+    assert not sim.ask(2, 1)
+    assert sim.hands[0] == counts(2, 4) and sim.current == 1 and sim.shown[0] == {2}
+    sim.current = 0
+    assert sim.ask(2, 1)
+    assert sim.hands[0] == counts(2, 2, 4) and sim.deck == [5]
+    
+    # A player without cards draws one, or passes once the deck is empty
+    sim.current = 2
+    sim.hands[2] = counts()
+    assert sim.start_turn() and sim.hands[2] == counts(5)
+    sim.hands[2] = counts()
+    assert not sim.start_turn() and sim.current == 0
+    
+    assert sim.score(0) == 1 + 5 / 16
+    sim.hands[0] = counts()
+    assert sim.score(0) == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rollout_horizon_is_relative_to_the_searching_seat(seed):
+    """With no horizon a rollout ends with the searching player's own turn."""
+    rng = random.Random(seed)
+    deck = [rank for rank in range(13) for _ in range(4)]
+    rng.shuffle(deck)
+    hands = [counts(*deck[i * 7:(i + 1) * 7]) for i in range(3)]
+    hands = [[min(count, 3) for count in hand] for hand in hands]
+    
+    # Still the searching player's turn: only that turn is played out
+    sim = simulated_game([hand[:] for hand in hands], deck[21:])
+    sim.play_out(rng, 0, 0)
+    assert set(sim.askers) <= {0}
+    assert sim.current != 0 or not sim.cards_in_hands
+    
+    # The turn has already passed on: nothing is played
+    sim = simulated_game([hand[:] for hand in hands], deck[21:], current=1)
+    sim.play_out(rng, 0, 0)
+    assert sim.askers == []
+    
+    # A horizon counts the asks after the searching player's turn, wherever it ended
+    sim = simulated_game([hand[:] for hand in hands], deck[21:], current=1)
+    sim.play_out(rng, 0, 3)
+    assert len(sim.askers) <= 3
+    sim = simulated_game([hand[:] for hand in hands], deck[21:])
+    sim.play_out(rng, 0, 3)
+    own_turn = next((i for i, seat in enumerate(sim.askers) if seat != 0), len(sim.askers))
+    assert len(sim.askers) - own_turn <= 3
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dealt_games_agree_with_the_table(seed):
+    """Deals of the unseen cards keep every public fact about the real game."""
+    player = MCTSPlayer("MCTS-1", iterations=4)
+    players = [player, RandomPlayer("Random-2"), RandomPlayer("Random-3")]
+    game = GoFishGame(players=players, verbose=False, rng=random.Random(seed))
+    game.setup()
+    
+    while not game.game_over:
+        if game.current_player_idx == 0 and player.has_cards():
+            booked = {rank for p in players for rank in p.books}
+            for _ in range(10):
+                sim = player._deal_unseen()
+                assert sim.hands[0] == player.hand.rank_counts
+                assert [sum(hand) for hand in sim.hands] == [len(p.hand) for p in players]
+                assert len(sim.deck) == len(game.deck)
+                assert sim.books == [len(p.books) for p in players]
+                assert not booked & set(sim.deck)
+                for hand in sim.hands:
+                    assert all(hand[rank] == 0 for rank in booked)
+                    assert max(hand) <= 3
+        game.play_turn()
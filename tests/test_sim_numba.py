@@ -0,0 +1,68 @@
+"""
+Tests for the compiled simulation core.
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+_sim_numba = pytest.importorskip("gofish._sim_numba")
+
+from gofish.cards import Deck, rank_of
+from gofish.game import GoFishGame
+from gofish.player import RandomPlayer, SmartPlayer, MemoryPlayer
+
+STRATEGIES = [RandomPlayer.strategy_id, SmartPlayer.strategy_id, MemoryPlayer.strategy_id]
+
+
+@pytest.mark.parametrize("initial_cards", [0, 1, 7, 20])
+def test_every_game_lays_down_all_books(initial_cards):
+    """Every game is played until all 13 books are down."""
+    books = _sim_numba.simulate_games(200, np.array(STRATEGIES, np.int8), initial_cards, 1)
+    assert books.shape == (200, 3)
+    assert (books.sum(axis=1) == 13).all()
+
+
+def test_seed_reproduces_game():
+    """The same seed plays the same game."""
+    strategies = np.array(STRATEGIES, np.int8)
+    _, books = _sim_numba.simulate_game(strategies, 7, 5)
+    assert (_sim_numba.simulate_game(strategies, 7, 5)[1] == books).all()
+    first = _sim_numba.simulate_games(50, strategies, 7, 9)
+    assert (first == _sim_numba.simulate_games(50, strategies, 7, 9)).all()
+
+
+def test_empty_initial_hands_are_played_out():
+    """With no cards dealt, the first players draw from the deck and play on."""
+    rng = random.Random(3)
+    deck = Deck(shuffled=True, rng=rng)
+    book_owners, turns = _sim_numba.run_game(STRATEGIES, deck.cards, 0, rng)
+    assert turns > 0
+    assert -1 not in book_owners
+
+
+def test_random_stream_matches_python():
+    """Seeded states, draws and the shuffled deck follow random.Random exactly."""
+    for seed in (0, 1, 12345, 2**40 + 7, 2**63 - 1):
+        rng = random.Random(seed)
+        mt = _sim_numba._seed_state(seed)
+        assert mt.tolist() == list(rng.getstate()[1])
+        assert [_sim_numba._randbelow(mt, n) for n in range(1, 100)] == \
+            [rng._randbelow(n) for n in range(1, 100)]
+        deck = Deck(shuffled=True, rng=rng)
+        assert _sim_numba._shuffled_deck(mt).tolist() == [rank_of(card) for card in reversed(deck.cards)]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("initial_cards", [0, 7])
+def test_simulate_games_matches_python_game(initial_cards):
+    """Game i of simulate_games is the game GoFishGame plays with random.Random(seed + i)."""
+    n_games = 200
+    compiled = _sim_numba.simulate_games(n_games, np.array(STRATEGIES, np.int8), initial_cards, 100)
+    
+    for game_index in range(n_games):
+        players = [RandomPlayer("Random"), SmartPlayer("Smart"), MemoryPlayer("Memory")]
+        game = GoFishGame(players, initial_cards=initial_cards, verbose=False,
+                          rng=random.Random(100 + game_index))
+        game.play_game()
+        assert compiled[game_index].tolist() == [len(player.books) for player in players]